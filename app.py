@@ -6,34 +6,49 @@ QKB lead finder — Render-ready Flask app
 - Optionally fetches each subject's "simple" PDF and extracts email/phone
 Deploy on Render:
   - requirements.txt
-  - Procfile          (web: gunicorn app:app)
+  - Procfile          (web: gunicorn -k gthread -w 1 --threads 8 --timeout 120 app:app)
   - app.py            (this file)
+  - pdf_contacts.py   (PDF -> email/phone; kept free of pandas/Flask for the PDF worker processes)
 """
 import os
 import re
 import io
 import csv
-import ast
 import json
 import time
-import base64
+import binascii
+import gzip
+import hashlib
+import html
 import pathlib
-import tempfile
+import uuid
 from datetime import datetime
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional, NamedTuple, Sequence, Union
 import shutil
+from types import MappingProxyType
+from urllib.parse import quote_plus, urlencode
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from flask import Flask, request, Response, send_file, redirect
+from flask import Flask, request, Response, send_file, send_from_directory, redirect
 import pandas as pd
-from bs4 import BeautifulSoup
 import threading
+import multiprocessing
+
+from pdf_contacts import parse_pdf_bytes
+
+try:
+    import orjson  # 3-5x faster than stdlib json on the big QKB payloads
+    json_loads = orjson.loads
+except Exception as e:
+    json_loads = json.loads
 
 try:
-    import pdfplumber  # heavy, but works on Render
+    import httpx  # optional HTTP/2 transport, see USE_HTTP2
 except Exception as e:
-    pdfplumber = None
+    httpx = None
 
 # -----------------------
 # Config
@@ -43,6 +58,13 @@ SEARCH_URL = "https://format.qkb.gov.al/kerko-per-subjekt/"
 DOC_URL = "https://format.qkb.gov.al/wp-content/themes/twentytwentyfive-child/modules/search/national-registry/subject/search-for-subject-get-documents.php"
 EXPORT_DIR = os.environ.get("EXPORT_DIR", "exports")
 os.makedirs(EXPORT_DIR, exist_ok=True)
+PERSIST_EXPORTS = os.environ.get("PERSIST_EXPORTS", "0") == "1"  # also write each CSV into EXPORT_DIR
+CONTACT_CACHE_DIR = os.path.join(EXPORT_DIR, ".contact_cache")
+CONTACT_CACHE_PATH = os.path.join(CONTACT_CACHE_DIR, "contact_cache.json")
+CONTACT_CACHE_FLUSH_EVERY = 20  # write the cache to disk after this many new entries
+CONTACT_CACHE_TTL = float(os.environ.get("CONTACT_CACHE_TTL", str(30 * 86400)))  # seconds; contacts change rarely
+KW_CACHE_DIR = os.path.join(EXPORT_DIR, ".kw_cache")
+KW_CACHE_TTL = int(os.environ.get("KW_CACHE_TTL", str(6 * 3600)))  # seconds a keyword result stays fresh
 
 # Conservative headers + UA
 BASE_HEADERS = {
@@ -56,12 +78,44 @@ BASE_HEADERS = {
 MAX_DEFAULT_KEYWORDS = int(os.environ.get('MAX_DEFAULT_KEYWORDS', '20'))  # cap default list
 SEARCH_TIMEOUT = (10, 25)   # (connect, read)
 DOC_TIMEOUT    = (10, 35)
-
+USE_HTTP2 = "1" in (os.environ.get("USE_HTTP2", "0"), os.environ.get("USE_HTTPX", "0"))  # httpx/HTTP2 instead of requests/HTTP1.1
+SCRAPE_WORKERS = int(os.environ.get("SCRAPE_WORKERS", "8"))    # parallel keyword searches (network-bound)
+JOB_WORKERS = 4  # scrape jobs running at once (background executor)
+CONTACT_WORKERS = int(os.environ.get("CONTACT_WORKERS", "8"))  # parallel PDF fetch + parse for contacts
+# PDF parsing in worker processes: opt-in, each child is another interpreter on a small
+# dyno (and cpu_count() reports the host's CPUs, not the dyno's quota). <=1: parse in threads
+PDF_PROCESSES = int(os.environ.get("PDF_PROCESSES", "1"))
+PDF_INFLIGHT = 10           # max PDFs downloaded/being parsed at once (memory bound)
+
+
+# Search form as the site posts it; only sektoriIVeprimtarise / qarku / qyteti vary per call
+SEARCH_PAYLOAD = MappingProxyType({
+    "orderColumn": "0",
+    "orderDir": "asc",
+    "nipt": "",
+    "emriISubjektit": "",
+    "emriTregtar": "",
+    "formeLigjore": "",
+    "pronesia": "",
+    "dataNga": "",
+    "dataNe": "",
+    "numriId": "",
+    "administrator": "",
+    "aksionerOrtak": "",
+    "sektoriIVeprimtarise": "",
+    "qarku": "",
+    "qyteti": "",
+    "adresa": "",
+})
+_SEARCH_VARYING = ("sektoriIVeprimtarise", "qarku", "qyteti")
+# the constant fields, url-encoded once; search_body() appends the three that vary
+_SEARCH_BODY_STATIC = urlencode({k: v for k, v in SEARCH_PAYLOAD.items() if k not in _SEARCH_VARYING})
 
 # Robust regex for JSON.parse("...") pattern used by the site
 JSON_PARSE_RX = re.compile(r'response\s*=\s*JSON\.parse\(\s*(["\'])([\s\S]*?)\1\s*\)')
+_json_parse_rx_search = JSON_PARSE_RX.search
 
-KEYWORDS = [
+KEYWORDS = (
     # Gaming / PlayStation / LAN
     "gaming", "sallë gaming", "sallë lojrash", "lan center", "cybercafe", "internet cafe",
     "internet café", "playstation", "sallë playstation", "ps4 lounge", "ps5 lounge",
@@ -130,36 +184,241 @@ KEYWORDS = [
     "taxi dispatch center", "fleet operations tiranë", "web agency tiranë",
     "cloud hosting provider tiranë", "dedicated fiber business", "dark fiber lease",
     "server maintenance contract", "managed voip services",
-]
+)
 
-RE_EMAIL = re.compile(r"(?i)\b(?:e\s*[-–—]?\s*mail|email)\s*:?\s*([A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,})")
-RE_PHONE = re.compile(r"(?i)\b(?:telefon|tel)\s*:?\s*([+()\d][0-9 +()\-]{6,})")
+def _dedup_substrings(keywords: Sequence[str]) -> List[str]:
+    """
+    QKB matches `sektoriIVeprimtarise` as a substring, so "gaming" already returns every
+    "gaming lounge" hit. Drop any keyword containing a shorter kept one (case-insensitive),
+    scanning shortest-first; the survivors keep their original order.
+    """
+    kept: List[str] = []
+    for kw in sorted(dict.fromkeys(keywords), key=len):
+        low = kw.casefold()
+        if not any(k in low for k in kept):
+            kept.append(low)
+    keep = set(kept)
+    out: List[str] = []
+    for kw in keywords:
+        low = kw.casefold()
+        if low in keep:
+            keep.discard(low)  # first spelling wins
+            out.append(kw)
+    return out
+
+KEYWORDS_ALL = tuple(dict.fromkeys(KEYWORDS))  # read-only; exact repeats dropped
+KEYWORDS = tuple(_dedup_substrings(KEYWORDS_ALL))
+# the default run (empty keyword box), sliced once
+_DEFAULT_KWS = KEYWORDS[:MAX_DEFAULT_KEYWORDS]
+_DEFAULT_KWS_ALL = KEYWORDS_ALL[:MAX_DEFAULT_KEYWORDS]
 
 app = Flask(__name__)
 
+# Background scrape jobs (process-local): job_id -> Future of run_scrape(...)
+JOBS: Dict[str, Future] = {}
+EXECUTOR = ThreadPoolExecutor(max_workers=JOB_WORKERS)
+MAX_JOBS = 20  # finished jobs beyond this are dropped, oldest first
+JOBS_LOCK = threading.Lock()
+
+# -----------------------
+# Contact cache (nipt -> email/phone, persisted under EXPORT_DIR)
+# -----------------------
+def _load_contact_cache() -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(CONTACT_CACHE_PATH, encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            return {}
+        cutoff = time.time() - CONTACT_CACHE_TTL
+        return {k: v for k, v in data.items() if v.get("ts", 0) >= cutoff}  # expired entries aren't carried over
+    except Exception:
+        return {}
+
+_contact_cache = _load_contact_cache()
+# second level: same PDF content under another NIPT / after a forced refetch -> no reparse
+_contact_cache_md5 = {v["md5"]: (v.get("email"), v.get("phone")) for v in _contact_cache.values() if v.get("md5")}
+_contact_cache_lock = threading.Lock()
+_contact_cache_pending = 0
+
+def _flush_contact_cache_locked() -> None:
+    global _contact_cache_pending
+    try:
+        os.makedirs(CONTACT_CACHE_DIR, exist_ok=True)
+        tmp_path = CONTACT_CACHE_PATH + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(_contact_cache, f, ensure_ascii=False)
+        os.replace(tmp_path, CONTACT_CACHE_PATH)  # atomic: readers never see a half-written file
+        _contact_cache_pending = 0
+    except Exception:
+        pass  # best-effort like the keyword cache: entries stay in memory, next flush retries
+
+def flush_contact_cache() -> None:
+    with _contact_cache_lock:
+        if _contact_cache_pending:
+            _flush_contact_cache_locked()
+
+def _cached_contacts(nipt: str) -> Optional[Tuple[str, str]]:
+    """(email, phone) from the cache if this NIPT was parsed within CONTACT_CACHE_TTL."""
+    hit = _contact_cache.get(nipt)
+    if hit and time.time() - hit.get("ts", 0) < CONTACT_CACHE_TTL:
+        return (hit.get("email"), hit.get("phone"))
+    return None
+
+def clear_contact_cache() -> int:
+    """Forget every cached contact, in memory and on disk. Returns count of removed NIPTs."""
+    global _contact_cache_pending
+    with _contact_cache_lock:
+        n = len(_contact_cache)
+        _contact_cache.clear()
+        _contact_cache_md5.clear()
+        _contact_cache_pending = 0
+        try:
+            os.remove(CONTACT_CACHE_PATH)
+        except FileNotFoundError:
+            pass
+    return n
+
+def _remember_contacts(nipt: str, email: str, phone: str, md5: str) -> None:
+    global _contact_cache_pending
+    with _contact_cache_lock:
+        _contact_cache[nipt] = {"email": email, "phone": phone, "md5": md5, "ts": time.time()}
+        _contact_cache_md5[md5] = (email, phone)
+        _contact_cache_pending += 1
+        if _contact_cache_pending >= CONTACT_CACHE_FLUSH_EVERY:
+            _flush_contact_cache_locked()
+
+if httpx is not None:
+    class Http2Session(httpx.Client):
+        """httpx client (HTTP/2) that also takes the requests-style (connect, read) timeouts used here."""
+        def request(self, method, url, *, timeout=httpx.USE_CLIENT_DEFAULT, **kwargs):
+            if isinstance(timeout, tuple) and len(timeout) == 2:
+                timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+            if isinstance(kwargs.get("data"), bytes):
+                kwargs["content"] = kwargs.pop("data")  # pre-encoded body (search_body)
+            return super().request(method, url, timeout=timeout, **kwargs)
+
 def make_session() -> requests.Session:
+    if USE_HTTP2 and httpx is not None:
+        try:
+            # one TLS connection, all keyword/PDF requests multiplexed as HTTP/2 streams. The
+            # limits go on the transport (Client ignores its own once a transport is given);
+            # the connection cap only matters if the server falls back to HTTP/1.1.
+            pool_size = max(SCRAPE_WORKERS, CONTACT_WORKERS) * JOB_WORKERS
+            return Http2Session(
+                http2=True,
+                headers=BASE_HEADERS,
+                transport=httpx.HTTPTransport(
+                    http2=True, retries=5,
+                    limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+                ),
+            )
+        except ImportError:
+            pass  # httpx installed without the h2 extra -> stay on requests
     s = requests.Session()
     retries = Retry(total=5, backoff_factor=0.6, status_forcelist=[429, 500, 502, 503, 504])
-    s.mount("https://", HTTPAdapter(max_retries=retries))
+    # keep-alive pool sized for every worker thread of every concurrent job (they all share
+    # SESSION): none blocks on (or throws away) a connection because the pool is full
+    pool_size = max(SCRAPE_WORKERS, CONTACT_WORKERS) * JOB_WORKERS
+    s.mount("https://", HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries))
     s.headers.update(BASE_HEADERS)
     return s
 
-def _split_people(s: str) -> List[str]:
-    return [x.strip() for x in (s or "").split(";") if x.strip()]
+# one long-lived client for the whole process: TCP/TLS connections are reused across jobs
+SESSION = make_session()
+
+class RateLimiter:
+    """
+    Minimum interval between request starts, shared by every job's worker threads:
+    each caller reserves the first slot at least `interval` after the previous one
+    and sleeps only for what's left of it, so time already spent waiting on QKB
+    counts towards the politeness delay. The interval is per call (each job has its
+    own delay), the spacing is global.
+    """
+    def __init__(self):
+        self._last = float("-inf")  # monotonic time of the latest reserved slot
+        self._lock = threading.Lock()
+
+    def acquire(self, interval: float):
+        if interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._last + interval)
+            self._last = slot
+        if slot > now:
+            time.sleep(slot - now)
+
+# one limiter for the process: concurrent jobs (JOB_WORKERS) must not each get their own quota
+QKB_LIMITER = RateLimiter()
+
 
+def _find_json_parse_literal(text: str) -> Optional[Tuple[str, str]]:
+    """
+    Locate `response = JSON.parse("...")` with str.find and return (quote, inner).
+    The closing quote is the first one not escaped by an odd run of backslashes.
+    Returns None if the page doesn't have the expected shape.
+    """
+    def _skip_ws_back(end: int) -> int:
+        while end > 0 and text[end - 1].isspace():
+            end -= 1
+        return end
+
+    marker = "JSON.parse("
+    i = text.find(marker)
+    while i >= 0:
+        # same anchor as JSON_PARSE_RX: `response\s*=\s*JSON.parse(`
+        end = _skip_ws_back(i)
+        if text.endswith("=", 0, end) and text.endswith("response", 0, _skip_ws_back(end - 1)):
+            break
+        i = text.find(marker, i + len(marker))
+    if i < 0:
+        return None
+    start = i + len(marker)
+    while start < len(text) and text[start].isspace():
+        start += 1
+    if start >= len(text) or text[start] not in "\"'":
+        return None
+    quote = text[start]
+    start += 1
+    j = text.find(quote, start)
+    while j >= 0:
+        k = j
+        while k > start and text[k - 1] == "\\":
+            k -= 1
+        if (j - k) % 2 == 0:
+            return quote, text[start:j]
+        j = text.find(quote, j + 1)
+    return None
+
+
+def _decode_js_literal(quote: str, inner: str) -> str:
+    """Undo the JS string escaping of the JSON.parse argument -> JSON text."""
+    if quote == '"':
+        # the site emits json_encode()d strings, whose escapes (\" \\ \/ \uXXXX) are
+        # exactly JSON's: decoding them as a JSON string is C-speed, no Python parser
+        try:
+            return json_loads('"' + inner + '"')
+        except ValueError:
+            pass
+    # rare JS-only escapes (\' or \xNN), or a single-quoted literal: the unicode_escape codec
+    # covers those; backslashreplace keeps non-latin-1 text intact through the latin-1 hop
+    return inner.encode("latin-1", "backslashreplace").decode("unicode_escape")
 
-def parse_rows_from_response(html_text: str, content_type: str = "") -> List[Dict[str, Any]]:
+
+def parse_rows_from_response(body: Union[str, bytes], content_type: str = "", encoding: str = "utf-8") -> List[Dict[str, Any]]:
     """
     Try multiple response shapes:
     1) Direct JSON (array or object)
     2) HTML with JS: JSON.parse("...")
+    `body` may be the raw response bytes: JSON is parsed straight from them and
+    only the HTML case is decoded to text.
     """
-    raw = (html_text or "").strip()
+    raw = (body or "").strip()
 
     # 1) Direct JSON
-    if raw.startswith("{") or raw.startswith("[") or content_type.lower().startswith("application/json"):
+    if raw[:1] in ("{", "[", b"{", b"[") or content_type.lower().startswith("application/json"):
         try:
-            obj = json.loads(raw)
+            obj = json_loads(raw)
             # DataTables-style wrappers
             if isinstance(obj, dict):
                 for k in ("data", "rows", "aaData", "results"):
@@ -172,21 +431,37 @@ def parse_rows_from_response(html_text: str, content_type: str = "") -> List[Dic
         except Exception as _:
             pass
 
-    # 2) Embedded JSON.parse("...")
-    m = JSON_PARSE_RX.search(raw or "")
-    if m:
-        quote = m.group(1); inner = m.group(2)
-        json_text = ast.literal_eval(quote + inner + quote)
-        rows = json.loads(json_text)
+    # 2) Embedded JSON.parse("...") - plain string scan, regex only as fallback
+    if isinstance(raw, bytes):
+        raw = raw.decode(encoding or "utf-8", errors="replace")
+    lit = _find_json_parse_literal(raw)
+    if lit is None:
+        m = _json_parse_rx_search(raw)
+        lit = (m.group(1), m.group(2)) if m else None
+    if lit:
+        rows = json_loads(_decode_js_literal(*lit))
         return rows if isinstance(rows, list) else []
 
     raise RuntimeError("QKB: unexpected search response (no JSON / JSON.parse)")
 
 
-def normalize_dataframe(rows: List[Dict[str, Any]], keyword: str) -> pd.DataFrame:
+# Output schema: normalize_dataframe always returns exactly these columns and dtypes
+# (+ _keyword/_error), whether QKB sent every field or none
+COLS_DTYPES = {
+    "nipt": "object", "name": "object", "trade_name": "object", "sector": "object",
+    "owners": "object", "legal_form": "object", "status": "object", "city": "object",
+    "citizenship": "object", "registered_at": "datetime64[ns]",
+}
+_EXPORT_DTYPES = {**COLS_DTYPES, "_keyword": "object", "_error": "object"}
+EXPORT_FIELDS = list(_EXPORT_DTYPES)
+PREVIEW_ROWS = 25  # rows shown in the HTML summary
+_EMPTY_SCHEMA = {col: pd.Series(dtype=t) for col, t in _EXPORT_DTYPES.items()}
+
+def normalize_dataframe(rows: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Build the export table ONCE from raw QKB rows tagged with `_keyword` (and `_error`)."""
     df = pd.DataFrame(rows)
     if df.empty:
-        return pd.DataFrame([{"_keyword": keyword}]).assign(nipt=pd.NA, name=pd.NA)
+        return pd.DataFrame(_EMPTY_SCHEMA)
     df = df.rename(columns={
         "nipti": "nipt",
         "emriISubjektit": "name",
@@ -196,129 +471,235 @@ def normalize_dataframe(rows: List[Dict[str, Any]], keyword: str) -> pd.DataFram
         "statusiISubjektit": "status",
         "qyteti": "city",
         "shtetesia": "citizenship",
+        "dataERegjistrimit": "registered_at",
+        "adminOrtakAksionar": "owners",
     })
+    # column-wise, no per-row Python: dates come as "01\/02\/2020", people as "A; B; "
     if "registered_at" in df.columns:
-        df["registered_at"] = pd.to_datetime(df["registered_at"], format="%d/%m/%Y", errors="coerce")
-    cols = ["nipt","name","trade_name","sector","owners","legal_form","status","city","citizenship","registered_at"]
-    for c in cols:
+        dates = df["registered_at"].astype("string").str.replace("\\/", "/", regex=False)
+        df["registered_at"] = pd.to_datetime(dates, format="%d/%m/%Y", errors="coerce")
+    if "owners" in df.columns:
+        split = df["owners"].astype("string").str.split(";")
+        df["owners"] = [[x.strip() for x in people if x.strip()] if isinstance(people, list) else pd.NA
+                        for people in split]
+    for c, t in _EXPORT_DTYPES.items():
         if c not in df.columns:
-            df[c] = pd.NA
-    return df[cols].assign(_keyword=keyword)
-
-def search_keyword(session: requests.Session, kw: str, city: str, qarku: str = "") -> pd.DataFrame:
-    payload = {
-        "orderColumn": "0",
-        "orderDir": "asc",
-        "nipt": "",
-        "emriISubjektit": "",
-        "emriTregtar": "",
-        "formeLigjore": "",
-        "pronesia": "",
-        "dataNga": "",
-        "dataNe": "",
-        "numriId": "",
-        "administrator": "",
-        "aksionerOrtak": "",
-        "sektoriIVeprimtarise": kw,
-        "qarku": qarku,
-        "qyteti": city,
-        "adresa": "",
-    }
-    r = session.post(SEARCH_URL, data=payload, timeout=SEARCH_TIMEOUT)
+            df[c] = pd.Series(index=df.index, dtype=t)
+    return df[EXPORT_FIELDS].astype(_EXPORT_DTYPES)
+
+def _kw_cache_path(kw: str, city: str, qarku: str) -> str:
+    key = hashlib.sha1(f"{city}|{qarku}|{kw}".encode("utf-8")).hexdigest()
+    return os.path.join(KW_CACHE_DIR, f"{key}.json")
+
+def _read_kw_cache(path: str) -> Optional[List[Dict[str, Any]]]:
+    try:
+        with open(path, "rb") as f:
+            entry = json_loads(f.read())
+        if time.time() - entry["ts"] < KW_CACHE_TTL:
+            return entry["rows"]
+    except Exception:
+        pass
+    return None
+
+def _write_kw_cache(path: str, rows: List[Dict[str, Any]]) -> None:
+    try:
+        os.makedirs(KW_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"ts": time.time(), "rows": rows}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except Exception:
+        pass  # cache is best-effort; the scrape result is what matters
+
+def search_body(kw: str, city: str, qarku: str = "") -> bytes:
+    """Url-encoded search form; only the three varying fields are encoded per call."""
+    return (f"{_SEARCH_BODY_STATIC}&sektoriIVeprimtarise={quote_plus(kw)}"
+            f"&qarku={quote_plus(qarku)}&qyteti={quote_plus(city)}").encode("ascii")
+
+def search_keyword(session: requests.Session, kw: str, city: str, qarku: str = "",
+                   force: bool = False, delay: float = 0.0) -> List[Dict[str, Any]]:
+    """
+    Raw QKB rows for one keyword. Successful results are cached per (city, qarku, kw)
+    for KW_CACHE_TTL, so a rerun after a failed/partial scrape skips finished keywords.
+    Only an actual request to QKB waits on the shared rate limiter (`delay`).
+    """
+    cache_path = _kw_cache_path(kw, city, qarku)
+    if not force:
+        rows = _read_kw_cache(cache_path)
+        if rows is not None:
+            return rows
+    QKB_LIMITER.acquire(delay)
+    r = session.post(SEARCH_URL, data=search_body(kw, city, qarku), timeout=SEARCH_TIMEOUT)
+    r.raise_for_status()
+    # bytes, not r.text: no charset guessing/decoding when the answer is plain JSON
+    rows = parse_rows_from_response(r.content, r.headers.get('Content-Type',''), r.encoding)
+    _write_kw_cache(cache_path, rows)
+    return rows
+
+def fetch_pdf_bytes(session: requests.Session, nipt: str) -> bytes:
+    """Download the subject's "simple" extract (network only). Returns b"" if QKB has none."""
+    payload = {"nipt": nipt, "docType": "simple"}
+    r = session.post(DOC_URL, data=payload, timeout=DOC_TIMEOUT)
     r.raise_for_status()
-    rows = parse_rows_from_response(r.text, r.headers.get('Content-Type',''))
-    return normalize_dataframe(rows, kw)
 
-def extract_contacts_for_nipt(session: requests.Session, nipt: str) -> Tuple[str, str]:
+    # handle JSON even if CT is text/html; parse the raw bytes so no decoded r.text copy is made
+    data = json_loads(r.content)
+    r.close()
+    pdf_b64 = data.get("data")
+    if not pdf_b64:
+        return b""
+    # a2b_base64 takes the ASCII str as-is (b64decode would first re-encode it to bytes)
+    return binascii.a2b_base64(pdf_b64)
+
+def extract_contacts_for_nipt(session: requests.Session, nipt: str, force_refresh: bool = False) -> Tuple[str, str]:
     if not nipt:
         return (None, None)
+    if not force_refresh:
+        hit = _cached_contacts(nipt)
+        if hit:
+            return hit
     try:
-        payload = {"nipt": nipt, "docType": "simple"}
-        r = session.post(DOC_URL, data=payload, timeout=DOC_TIMEOUT)
-        r.raise_for_status()
-
-        # handle JSON even if CT is text/html
-        data = r.json() if r.headers.get("Content-Type","").startswith("application/json") else json.loads(r.text)
-        pdf_b64 = data.get("data")
-        if not pdf_b64:
+        pdf_bytes = fetch_pdf_bytes(session, nipt)
+        if not pdf_bytes:
             return (None, None)
-
-        pdf_bytes = base64.b64decode(pdf_b64)
-
-        # Write to temp file like your notebook (pdfplumber is happiest with files)
-        with tempfile.NamedTemporaryFile(prefix="qkb_", suffix=".pdf", delete=False) as tmp:
-            tmp.write(pdf_bytes)
-            tmp_path = tmp.name
-
-        text_chunks = []
-        email, phone = None, None
-
-        if pdfplumber:
-            with pdfplumber.open(tmp_path) as pdf:
-                for page in pdf.pages:
-                    # normalize whitespace a bit (layout can be funky)
-                    t = page.extract_text() or ""
-                    t = " ".join(t.split())
-                    text_chunks.append(t)
-
-            combined = "\n".join(text_chunks)   # real newline, not "\\"+"n"
-            # Try whole doc
-            m_e = RE_EMAIL.search(combined)
-            m_p = RE_PHONE.search(combined)
-            email = (m_e.group(1).strip() if m_e else None)
-            phone = (m_p.group(1).strip() if m_p else None)
-
-            # if still nothing, try first page only (your notebook behavior)
-            if not email or not phone:
-                first = text_chunks[0] if text_chunks else ""
-                if not email:
-                    m_e = RE_EMAIL.search(first); email = (m_e.group(1).strip() if m_e else None)
-                if not phone:
-                    m_p = RE_PHONE.search(first); phone = (m_p.group(1).strip() if m_p else None)
-
-        # cleanup temp
-        try:
-            os.unlink(tmp_path)
-        except Exception:
-            pass
-
+        md5 = hashlib.md5(pdf_bytes).hexdigest()
+        known = None if force_refresh else _contact_cache_md5.get(md5)
+        email, phone = known or _parse_contacts(pdf_bytes)
+        _remember_contacts(nipt, email, phone, md5)
         return (email, phone)
     except Exception:
         return (None, None)
 
-def run_scrape(keywords: List[str], city: str, qarku: str, delay: float, contacts: bool, max_contacts: int) -> Tuple[pd.DataFrame, str]:
-    s = make_session()
-    frames = []
-    for i, kw in enumerate(keywords, 1):
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+_pdf_pool_lock = threading.Lock()
+
+def get_pdf_pool() -> Optional[ProcessPoolExecutor]:
+    """Process pool for PDF parsing (pure-Python parsers hold the GIL); None -> parse in threads."""
+    global _pdf_pool
+    if PDF_PROCESSES <= 1:
+        return None
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            # spawn, not fork: forking a process that already runs threads can deadlock the child
+            _pdf_pool = ProcessPoolExecutor(max_workers=PDF_PROCESSES, mp_context=multiprocessing.get_context("spawn"))
+        return _pdf_pool
+
+def _discard_pdf_pool(pool: ProcessPoolExecutor) -> None:
+    """Forget a broken pool so the next PDF gets a fresh one."""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is pool:
+            _pdf_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def _parse_contacts(pdf_bytes: bytes) -> Tuple[str, str]:
+    """
+    parse_pdf_bytes in the process pool when there is one, else in the calling thread.
+    Raises BrokenProcessPool if a child died: that PDF is never retried in-process
+    (it may be what crashed the child), only the following ones get a fresh pool.
+    """
+    pool = get_pdf_pool()
+    if pool is None:
+        return parse_pdf_bytes(pdf_bytes)
+    try:
+        return pool.submit(parse_pdf_bytes, pdf_bytes).result()
+    except BrokenProcessPool:
+        _discard_pdf_pool(pool)
+        raise
+
+def extract_contacts_bulk(session: requests.Session, nipts: List[str], force_refresh: bool = False) -> Dict[str, Tuple[str, str]]:
+    """
+    Contacts for many NIPTs -> {nipt: (email, phone)}. Worker threads download on the
+    shared keep-alive session and hand the PDF to the process pool (if enabled); a
+    permit is taken before each download and returned once its PDF is parsed, so at
+    most PDF_INFLIGHT documents are held in memory.
+    """
+    found: Dict[str, Tuple[str, str]] = {}
+    inflight = threading.BoundedSemaphore(PDF_INFLIGHT)
+
+    def _one(n: str) -> None:
         try:
-            df_kw = search_keyword(s, kw, city, qarku)
-            frames.append(df_kw)
-        except Exception as e:
-            frames.append(pd.DataFrame([{"_keyword": kw, "_error": str(e)}]))
-        time.sleep(max(0.0, delay))
-    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
-    if "nipt" in df.columns:
-        df = df.drop_duplicates(subset=["nipt", "_keyword"], keep="first")
+            found[n] = extract_contacts_for_nipt(session, str(n).strip(), force_refresh)
+        finally:
+            inflight.release()
+
+    with ThreadPoolExecutor(max_workers=CONTACT_WORKERS) as ex:
+        for n in dict.fromkeys(nipts):
+            inflight.acquire()
+            ex.submit(_one, n)  # futures not kept: _one returns nothing, found holds the result
+    return found
+
+def dedup_by_nipt(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per NIPT, keeping the alphabetically first keyword. Only the rows whose
+    NIPT repeats get sorted; unique NIPTs pass through with a single hash pass.
+    """
+    dup_mask = df["nipt"].duplicated(keep=False)
+    if not dup_mask.any():
+        return df
+    kept = df.loc[~dup_mask]
+    sorted_dups = df.loc[dup_mask].sort_values("_keyword", kind="stable").drop_duplicates(subset=["nipt"], keep="first")
+    return pd.concat([kept, sorted_dups], ignore_index=True)
+
+class ScrapeResult(NamedTuple):
+    preview: pd.DataFrame   # first PREVIEW_ROWS rows, for the HTML summary
+    rows: int
+    filename: str
+    csv_gz: bytes           # gzip-compressed CSV, served straight from memory
+    path: Optional[str]     # plain CSV under EXPORT_DIR, only with PERSIST_EXPORTS=1
+
+def run_scrape(keywords: List[str], city: str, qarku: str, delay: float, contacts: bool, max_contacts: int,
+               force_refresh: bool = False, dedup: bool = False, force: bool = False) -> ScrapeResult:
+    """
+    Keyword results stay plain dicts; the DataFrame is built once over all of them at
+    the end and serialized once (gzip CSV in memory).
+    """
+    s = SESSION
+
+    def _search(kw: str) -> List[Dict[str, Any]]:
+        return search_keyword(s, kw, city, qarku, force=force, delay=delay)
+
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(SCRAPE_WORKERS, len(keywords)))) as ex:
+        futures = {ex.submit(_search, kw): kw for kw in dict.fromkeys(keywords)}
+        for fut in as_completed(futures):
+            kw = futures[fut]
+            try:
+                results[kw] = [{**row, "_keyword": kw} for row in fut.result()]
+            except Exception as e:
+                results[kw] = [{"_keyword": kw, "_error": str(e)}]
+    # keep the input keyword order regardless of completion order
+    all_rows = [row for kw in futures.values() for row in results[kw]]
+    df = normalize_dataframe(all_rows)
+    df = df.drop_duplicates(subset=["nipt", "_keyword"], keep="first")
     # optional contacts
-    if contacts and not df.empty and "nipt" in df.columns:
-        emails, phones = [], []
-        # cap number of PDFs to avoid timeouts
-        n = 0
-        for nipt in df["nipt"].tolist():
-            if pd.notna(nipt) and str(nipt).strip() and n < max_contacts:
-                e, p = extract_contacts_for_nipt(s, str(nipt).strip())
-                n += 1
-            else:
-                e, p = (None, None)
-            emails.append(e); phones.append(p)
-        df["email"] = emails
-        df["telefon"] = phones
-    # save
+    if contacts and not df.empty:
+        # one PDF per distinct NIPT (a company can match several keywords), capped to
+        # avoid timeouts; downloads in threads, parsing in processes
+        keys = df["nipt"].astype("string").str.strip()
+        nipts = keys[keys.notna() & (keys != "")].unique()[:max(0, max_contacts)].tolist()
+        found = extract_contacts_bulk(s, nipts, force_refresh)
+        emails_d = {n: e for n, (e, _) in found.items()}
+        phones_d = {n: p for n, (_, p) in found.items()}
+        df["email"] = keys.map(emails_d)
+        df["telefon"] = keys.map(phones_d)
+        flush_contact_cache()
+    # optional global dedup by NIPT only (collapse multiple keywords per company)
+    if dedup:
+        df = dedup_by_nipt(df)
+    # serialize once, after dedup: gzip in memory; disk copy only if asked for
     ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    fname = f"qkb_export_{city.replace(' ', '_')}_{ts}.csv"
-    fpath = os.path.join(EXPORT_DIR, fname)
-    df.to_csv(fpath, index=False, encoding="utf-8")
-    return df, fpath
+    fname = f"qkb_export_{city.replace(' ', '_')}_{ts}{'_dedup' if dedup else ''}.csv"
+    # owners stay lists in the preview; in the CSV they go back to "A; B" (not a Python repr)
+    out = df.assign(owners=df["owners"].map("; ".join, na_action="ignore"))
+    buf = io.BytesIO()
+    out.to_csv(buf, index=False, encoding="utf-8", compression="gzip")
+    fpath = None
+    if PERSIST_EXPORTS:
+        fpath = os.path.join(EXPORT_DIR, fname)
+        out.to_csv(fpath, index=False, encoding="utf-8")
+    return ScrapeResult(df.head(PREVIEW_ROWS), len(df), fname, buf.getvalue(), fpath)
+
 def clear_exports_dir() -> int:
     """Delete everything inside EXPORT_DIR. Returns count of removed items."""
     root = pathlib.Path(EXPORT_DIR).resolve()
@@ -336,39 +717,45 @@ def clear_exports_dir() -> int:
             # ignore stubborn files; you can log here if you want
             pass
     return deleted
-def html_page(body: str) -> str:
-    return f"""<!doctype html>
+
+# page chrome is static; html_page only splices in the optional refresh tag and the body
+_PAGE_OPEN = """<!doctype html>
 <html lang="sq">
 <head>
   <meta charset="utf-8">
-  <meta name="viewport" content="width=device-width, initial-scale=1">
+"""
+_PAGE_HEAD = """  <meta name="viewport" content="width=device-width, initial-scale=1">
   <title>QKB Lead Finder</title>
   <style>
-    :root {{ font-family: system-ui, -apple-system, Segoe UI, Roboto, Ubuntu, Cantarell, 'Helvetica Neue', Arial, 'Noto Sans', 'Liberation Sans', sans-serif; }}
-    body {{ margin: 24px; }}
-    .wrap {{ max-width: 1100px; margin: 0 auto; }}
-    h1 {{ font-size: 28px; margin-bottom: 0.2rem; }}
-    p.meta {{ color: #666; margin-top: 0; }}
-    form input, form select, form textarea {{ width: 100%; padding: 10px; margin-top: 6px; margin-bottom: 14px; }}
-    button {{ padding: 10px 16px; cursor: pointer; }}
-    .grid {{ display: grid; gap: 16px; grid-template-columns: repeat(4, 1fr); }}
-    .grid > div {{ border: 1px solid #e3e3e3; border-radius: 8px; padding: 10px; }}
-    table {{ width:100%; border-collapse: collapse; margin-top: 16px; }}
-    th, td {{ border-bottom: 1px solid #eee; text-align: left; padding: 8px; font-size: 14px; }}
-    code, pre {{ background: #f7f7f8; padding: 2px 6px; border-radius: 6px; }}
-    .note {{ background: #fff8e1; border: 1px solid #ffe082; padding: 10px; border-radius: 8px; }}
-    .ok {{ color: #0a7; }}
+    :root { font-family: system-ui, -apple-system, Segoe UI, Roboto, Ubuntu, Cantarell, 'Helvetica Neue', Arial, 'Noto Sans', 'Liberation Sans', sans-serif; }
+    body { margin: 24px; }
+    .wrap { max-width: 1100px; margin: 0 auto; }
+    h1 { font-size: 28px; margin-bottom: 0.2rem; }
+    p.meta { color: #666; margin-top: 0; }
+    form input, form select, form textarea { width: 100%; padding: 10px; margin-top: 6px; margin-bottom: 14px; }
+    button { padding: 10px 16px; cursor: pointer; }
+    .grid { display: grid; gap: 16px; grid-template-columns: repeat(4, 1fr); }
+    .grid > div { border: 1px solid #e3e3e3; border-radius: 8px; padding: 10px; }
+    table { width:100%; border-collapse: collapse; margin-top: 16px; }
+    th, td { border-bottom: 1px solid #eee; text-align: left; padding: 8px; font-size: 14px; }
+    code, pre { background: #f7f7f8; padding: 2px 6px; border-radius: 6px; }
+    .note { background: #fff8e1; border: 1px solid #ffe082; padding: 10px; border-radius: 8px; }
+    .ok { color: #0a7; }
   </style>
 </head>
 <body><div class="wrap">
-{body}
+"""
+_PAGE_CLOSE = """
 </div></body>
 </html>"""
 
-@app.route("/", methods=["GET"])
-def index():
-    default_kw = ", ".join(KEYWORDS[:MAX_DEFAULT_KEYWORDS]) + ", …"  # preview only
-    body = f"""
+def html_page(body: str, refresh: int = 0) -> str:
+    meta_refresh = f'  <meta http-equiv="refresh" content="{refresh}">\n' if refresh else ""
+    return _PAGE_OPEN + meta_refresh + _PAGE_HEAD + body + _PAGE_CLOSE
+
+_DEFAULT_KW_PREVIEW = ", ".join(_DEFAULT_KWS) + ", …"  # placeholder only
+# nothing on the form varies per request: render it once at import
+_INDEX_HTML = html_page(f"""
     <h1>QKB Lead Finder</h1>
     <p class="meta">Scrape subjekte në QKB sipas fjalëkyçeve në <code>sektori i veprimtarisë</code>. Default qyteti: <b>{DEFAULT_CITY}</b>.</p>
     <form method="POST" action="/scrape">
@@ -379,7 +766,7 @@ def index():
       <input name="qarku" placeholder="p.sh. Tiranë" />
 
       <label>Fjalëkyçet (një për rresht) – lëre bosh për listën time të paracaktuar</label>
-      <textarea name="keywords" rows="6" placeholder="{default_kw}"></textarea>
+      <textarea name="keywords" rows="6" placeholder="{_DEFAULT_KW_PREVIEW}"></textarea>
 
       <div class="grid">
         <div>
@@ -395,7 +782,7 @@ def index():
         </div>
         <div>
           <label>Maks. subjekte për kontakt (PDF)</label>
-          <input name="max_contacts" type="number" value="50" />
+          <input name="max_contacts" type="number" min="0" value="50" />
         </div>
         <div>
           <label>Dedup global (NIPT)</label>
@@ -404,6 +791,20 @@ def index():
             <option value="no">Jo</option>
           </select>
         </div>
+        <div>
+          <label>Injoro cache-in e fjalëkyçeve</label>
+          <select name="force">
+            <option value="0" selected>Jo</option>
+            <option value="1">Po</option>
+          </select>
+        </div>
+        <div>
+          <label>Dërgo çdo fjalëkyç (edhe ato që i mbulon një më i shkurtër, p.sh. "gaming" → "gaming lounge")</label>
+          <select name="no_dedup_kw">
+            <option value="0" selected>Jo</option>
+            <option value="1">Po</option>
+          </select>
+        </div>
       </div>
       <button type="submit">Start</button>
     </form>
@@ -414,11 +815,19 @@ def index():
         🧹 Fshi folderin exports
       </button>
     </form>    
+    <form method="POST" action="/clear-contacts" style="margin-top:12px">
+      <button type="submit" style="padding:8px 12px;border-radius:6px">
+        ♻️ Fshi cache-in e kontakteve (PDF)
+      </button>
+    </form>
     <div class="note">
       <b>Shënim:</b> Mos e tepro me kërkesa. Mbaj një delay ≥ 0.3s. PDF-të janë të rënda – limito <i>Maks. subjekte për kontakt</i>.
     </div>
-    """
-    return html_page(body)
+    """)
+
+@app.route("/", methods=["GET"])
+def index():
+    return _INDEX_HTML
 
 @app.route("/scrape", methods=["POST"])
 def scrape():
@@ -428,87 +837,140 @@ def scrape():
     contacts = (request.form.get("contacts") or "no").lower() == "yes"
     max_contacts = int(request.form.get("max_contacts") or 50)
     dedup = (request.form.get("dedup") or "yes").lower() == "yes"
+    # ?forceRefresh=1 re-downloads PDFs even for NIPTs already in the contact cache
+    force_refresh = (request.values.get("forceRefresh") or "").lower() in ("1", "yes", "true")
+    # force=1 re-queries QKB even for keywords with a fresh cached result
+    force = (request.values.get("force") or "").lower() in ("1", "yes", "true")
+
+    # no_dedup_kw=1 (form select) sends every keyword as-is, even ones covered by a shorter keyword
+    no_dedup_kw = (request.values.get("no_dedup_kw") or "").lower() in ("1", "yes", "true")
 
     raw_kw = (request.form.get("keywords") or "").strip()
     if raw_kw:
         kws = [k.strip() for k in raw_kw.splitlines() if k.strip()]
+        if not no_dedup_kw:
+            kws = _dedup_substrings(kws)
     else:
-        kws = KEYWORDS[:MAX_DEFAULT_KEYWORDS]
-
-    df, fpath = run_scrape(kws, city, qarku, delay, contacts, max_contacts)
-    # optional global dedup by NIPT only (collapse multiple keywords per company)
-    if dedup and "nipt" in df.columns:
-        df = df.sort_values(["nipt", "_keyword"]).drop_duplicates(subset=["nipt"], keep="first")
-        dedup_ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        fpath = os.path.join(EXPORT_DIR, f"qkb_export_{city.replace(' ', '_')}_{dedup_ts}_dedup.csv")
-        df.to_csv(fpath, index=False, encoding="utf-8")
+        kws = list(_DEFAULT_KWS_ALL if no_dedup_kw else _DEFAULT_KWS)
+
+    # run in the background: big keyword lists outlive Render's/gunicorn's request timeout
+    job_id = uuid.uuid4().hex
+    # results (incl. the in-memory CSV) live in JOBS: keep only the most recent ones
+    with JOBS_LOCK:  # gthread: concurrent /scrape calls must not prune while another inserts
+        for old_id in [j for j, f in JOBS.items() if f.done()][:max(0, len(JOBS) - MAX_JOBS + 1)]:
+            JOBS.pop(old_id, None)
+        JOBS[job_id] = EXECUTOR.submit(run_scrape, kws, city, qarku, delay, contacts, max_contacts, force_refresh, dedup, force)
+    return redirect(f"/status/{job_id}", code=303)
+
+@app.route("/status/<job_id>", methods=["GET"])
+def status(job_id: str):
+    fut = JOBS.get(job_id)
+    if fut is None:
+        return Response("job not found", status=404)
+    if not fut.done():
+        body = f"""
+    <h1>Duke punuar…</h1>
+    <p class="meta">Puna <code>{job_id}</code> është në proces. Faqja rifreskohet vetë.</p>
+    <p><a href="/status/{job_id}">Rifresko</a></p>
+    """
+        return html_page(body, refresh=3)
+    try:
+        res = fut.result()
+    except Exception as e:
+        body = f"""
+    <h1>Gabim</h1>
+    <p>{html.escape(str(e))}</p>
+    <p><a href="/">↩︎ Kthehu</a></p>
+    """
+        return html_page(body)
 
     # HTML summary
-    head = df.head(25).to_html(index=False, justify="left")
-    size = os.path.getsize(fpath)
+    head = res.preview.to_html(index=False, justify="left")
+    saved = ""
+    if res.path:  # PERSIST_EXPORTS=1: the disk copy outlives this job
+        saved = f' · Kopja në disk: <a href="/download?path={quote_plus(res.path)}">{html.escape(res.filename)}</a>'
     body = f"""
     <h1>OK</h1>
-    <p class="ok">Gati. Rreshta: <b>{len(df)}</b>. <a href="/download?path={fpath}">Shkarko CSV</a> ({size} bytes)</p>
-    <details open><summary>Preview (25)</summary>{head}</details>
+    <p class="ok">Gati. Rreshta: <b>{res.rows}</b>. <a href="/download/{job_id}">Shkarko CSV</a> ({len(res.csv_gz)} bytes gzip){saved}</p>
+    <details open><summary>Preview ({PREVIEW_ROWS})</summary>{head}</details>
     <p><a href="/">↩︎ Kthehu</a></p>
     """
     return html_page(body)
 
+@app.route("/download/<job_id>", methods=["GET"])
+def download_job(job_id: str):
+    fut = JOBS.get(job_id)
+    if fut is None or not fut.done() or fut.exception() is not None:
+        return Response("not found", status=404)
+    res = fut.result()
+    gz_ok = request.accept_encodings["gzip"] > 0  # q-value aware: "gzip;q=0" means no
+    data = res.csv_gz if gz_ok else gzip.decompress(res.csv_gz)
+    # send_file quotes download_name and adds filename*=UTF-8'' for non-latin-1 cities
+    resp = send_file(io.BytesIO(data), as_attachment=True, download_name=res.filename, mimetype="text/csv")
+    if gz_ok:
+        resp.headers["Content-Encoding"] = "gzip"  # the browser inflates it and saves a plain .csv
+    resp.vary.add("Accept-Encoding")  # body depends on it: caches must not mix the two
+    return resp
+
 @app.route("/download", methods=["GET"])
 def download():
-    # naive path pass-through (we only serve from EXPORT_DIR)
-    fpath = request.args.get("path", "")
-    fpath = os.path.abspath(fpath)
-    if not fpath or not fpath.startswith(os.path.abspath(EXPORT_DIR)):
-        return Response("invalid path", status=400)
-    if not os.path.exists(fpath):
-        return Response("not found", status=404)
-    return send_file(fpath, as_attachment=True, download_name=os.path.basename(fpath), mimetype="text/csv")
+    # persisted exports only (PERSIST_EXPORTS=1); werkzeug's safe_join keeps it inside EXPORT_DIR
+    name = os.path.basename(request.args.get("path", ""))
+    return send_from_directory(os.path.abspath(EXPORT_DIR), name, as_attachment=True, mimetype="text/csv")
 
 @app.route("/clear-exports", methods=["POST"])
 def clear_exports():
     deleted = clear_exports_dir()
+    clear_contact_cache()  # its file lived under EXPORT_DIR; don't let the memory copy write it back
     body = f"""
     <h1>OK</h1>
     <p class="ok">U fshinë <b>{deleted}</b> element(e) nga <code>{EXPORT_DIR}</code>.</p>
     <p><a href="/">↩︎ Kthehu</a></p>
     """
     return html_page(body)
+
+@app.route("/clear-contacts", methods=["POST"])
+def clear_contacts():
+    removed = clear_contact_cache()
+    body = f"""
+    <h1>OK</h1>
+    <p class="ok">U fshinë kontaktet e ruajtura për <b>{removed}</b> subjekt(e).</p>
+    <p><a href="/">↩︎ Kthehu</a></p>
+    """
+    return html_page(body)
     
 @app.route("/debug/raw", methods=["GET"])
 def debug_raw():
     kw = request.args.get("kw", "gaming")
     city = request.args.get("city", DEFAULT_CITY)
     qarku = request.args.get("qarku", "")
-    s = make_session()
-    payload = {
-        "orderColumn": "0", "orderDir": "asc",
-        "nipt": "", "emriISubjektit": "", "emriTregtar": "", "formeLigjore": "",
-        "pronesia": "", "dataNga": "", "dataNe": "", "numriId": "",
-        "administrator": "", "aksionerOrtak": "",
-        "sektoriIVeprimtarise": kw, "qarku": qarku, "qyteti": city, "adresa": "",
-    }
-    r = s.post(SEARCH_URL, data=payload, timeout=SEARCH_TIMEOUT)
+    r = SESSION.post(SEARCH_URL, data=search_body(kw, city, qarku), timeout=SEARCH_TIMEOUT)
     ct = r.headers.get("Content-Type", "")
     txt = r.text[:4000]
     return Response(f"CT={ct}\n\n{txt}", mimetype="text/plain")
     
+@app.route("/healthz", methods=["GET", "HEAD"])
+def healthz():
+    return Response(b"ok", mimetype="text/plain")
+
 def keep_alive():
-    """Keep the Render app awake by pinging itself every 13 minutes"""
+    """Keep the Render app awake by pinging its /healthz every 13 minutes"""
     time.sleep(30)
     
-    # Replace with your actual Render URL
-    app_url = "https://franc-scraper.onrender.com/"
+    # Render exports the public URL; fall back to ours
+    app_url = os.environ.get("RENDER_EXTERNAL_URL", "https://franc-scraper.onrender.com").rstrip("/") + "/healthz"
     
     while True:
         try:
             time.sleep(13 * 60)  # 13 minutes
-            response = requests.get(app_url, timeout=10)
+            response = SESSION.head(app_url, timeout=10)  # no redirects followed, no body
             print(f"Keep-alive ping: {response.status_code}")
         except Exception as e:
             print(f"Keep-alive error: {e}")
     
-threading.Thread(target=keep_alive, daemon=True).start()
+# only on Render (it sets RENDER), and not in the PDF pool's spawned children (they re-import this module)
+if os.environ.get("RENDER") and multiprocessing.parent_process() is None:
+    threading.Thread(target=keep_alive, daemon=True).start()
 
 if __name__ == "__main__":
 
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Email/phone extraction from QKB "simple" extract PDFs.
+Kept apart from app.py on purpose: under gunicorn the spawned PDF-pool children import
+only this module, not pandas/Flask/requests, so each one stays a few MB instead of ~85 MB.
+(Under `python app.py` spawn also re-imports app.py in each child, as `__mp_main__`.)
+"""
+import os
+import re
+import io
+import functools
+import importlib
+import importlib.util
+import threading
+from typing import Iterator, Tuple
+
+try:
+    import re2 as _contact_re  # google-re2: same API as `re`, DFA-based, ~2-3x on long text
+except Exception as e:
+    _contact_re = re
+
+# PDF text engine: pypdfium2 | pymupdf | pypdf | pdfplumber (USE_PDFPLUMBER=1 still selects the old one)
+PDF_ENGINE = os.environ.get("PDF_ENGINE", "pdfplumber" if os.environ.get("USE_PDFPLUMBER") == "1" else "pypdfium2")
+
+# Contact patterns run over whole PDF pages: use RE2's linear-time engine when installed
+# email and phone in one alternation, so a page is scanned once for both
+_CONTACT_RX = _contact_re.compile(
+    r"(?i)\b(?:(?:e\s*[-–—]?\s*mail|email)\s*:?\s*(?P<email>[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,})"
+    r"|(?:telefon|tel)\s*:?\s*(?P<phone>[+()\d][0-9 +()\-]{6,}))"
+)
+_WS_RX = re.compile(r"\s+")  # page-text whitespace runs -> one space, without a token list
+
+@functools.lru_cache(maxsize=None)
+def _pdf_lib(module: str):
+    """Import a PDF library on first use: they're heavy, and most requests never parse a PDF."""
+    return importlib.import_module(module)
+
+def _installed(module: str) -> bool:
+    try:
+        return importlib.util.find_spec(module) is not None
+    except Exception:
+        return False
+
+# PDFium is not thread-safe, not even across separate documents: one document at a time
+# per process (the thread path runs up to CONTACT_WORKERS parses at once)
+_PDFIUM_LOCK = threading.Lock()
+
+def _pages_pypdfium2(pdf_bytes: bytes) -> Iterator[str]:
+    with _PDFIUM_LOCK:  # held until the generator finishes or is closed early
+        pdf = _pdf_lib("pypdfium2").PdfDocument(pdf_bytes)  # PDFium (C++), fastest of the engines here
+        try:
+            for page in pdf:
+                textpage = page.get_textpage()
+                try:
+                    yield textpage.get_text_bounded()
+                finally:
+                    textpage.close()
+                    page.close()
+        finally:
+            pdf.close()
+
+def _pages_pymupdf(pdf_bytes: bytes) -> Iterator[str]:
+    # optional (AGPL), only used with PDF_ENGINE=pymupdf
+    with _pdf_lib("pymupdf").open(stream=pdf_bytes, filetype="pdf") as doc:
+        for page in doc:
+            yield page.get_text()
+
+def _pages_pypdf(pdf_bytes: bytes) -> Iterator[str]:
+    reader = _pdf_lib("pypdf").PdfReader(io.BytesIO(pdf_bytes))
+    for page in reader.pages:
+        yield page.extract_text() or ""
+
+def _pages_pdfplumber(pdf_bytes: bytes) -> Iterator[str]:
+    # pdfplumber takes file-like objects: no temp file round-trip through the disk
+    with _pdf_lib("pdfplumber").open(io.BytesIO(pdf_bytes)) as pdf:
+        for page in pdf.pages:
+            yield page.extract_text() or ""
+
+# engine -> (module, page-text generator); fallback order when PDF_ENGINE isn't installed.
+# Only checked for presence here, the import itself waits for the first PDF.
+_PDF_ENGINES = {
+    "pypdfium2": ("pypdfium2", _pages_pypdfium2),
+    "pymupdf": ("pymupdf", _pages_pymupdf),
+    "pypdf": ("pypdf", _pages_pypdf),
+    "pdfplumber": ("pdfplumber", _pages_pdfplumber),
+}
+_PDF_PAGES = next((_PDF_ENGINES[e][1] for e in [PDF_ENGINE, *_PDF_ENGINES] if e in _PDF_ENGINES and _installed(_PDF_ENGINES[e][0])), None)
+
+def _iter_pdf_page_texts(pdf_bytes: bytes) -> Iterator[str]:
+    """Lazily yield page text with the PDF_ENGINE parser (or the first installed fallback)."""
+    if _PDF_PAGES is None:
+        # an error, not "no contacts": callers must not cache a result no parser produced
+        raise RuntimeError("no PDF engine installed (pypdfium2 / pymupdf / pypdf / pdfplumber)")
+    yield from _PDF_PAGES(pdf_bytes)
+
+def parse_pdf_bytes(pdf_bytes: bytes) -> Tuple[str, str]:
+    """Extract (email, phone) from PDF bytes (CPU only, no network)."""
+    email, phone = None, None
+    pages = _iter_pdf_page_texts(pdf_bytes)
+    try:
+        # contacts sit on page 1-2 of the QKB extract: stop extracting once both are found
+        for t in pages:
+            # normalize whitespace a bit (layout can be funky)
+            t = _WS_RX.sub(" ", t).strip()
+            for m in _CONTACT_RX.finditer(t):
+                if m.group("email"):
+                    email = email or m.group("email").strip()
+                elif m.group("phone"):
+                    phone = phone or m.group("phone").strip()
+                if email and phone:
+                    break
+            if email and phone:
+                break
+    finally:
+        pages.close()  # releases the PDF when we stop early
+
+    return (email, phone)